@@ -0,0 +1,29 @@
+"""Typed numeric helpers for progress arithmetic.
+
+These functions only touch floats and flat lists so they stay compatible
+with mypyc or Cython pure mode if a compiled build is ever wanted; the
+callers in progress_tracker.py keep all datetime/dict handling.
+"""
+from typing import List, Tuple
+
+def completion_percentage(progress: float, total_work: float) -> float:
+    return (progress / total_work) * 100.0 if total_work > 0 else 0.0
+
+def eta_seconds(progress: float, elapsed_s: float, total_work: float) -> float:
+    """Estimated seconds remaining given linear progress; 0.0 when unknown."""
+    if progress <= 0.0 or elapsed_s <= 0.0:
+        return 0.0
+    return (total_work - progress) * elapsed_s / progress
+
+def agg_times(times: List[float]) -> Tuple[float, float, float]:
+    """Return (average, fastest, slowest) for a non-empty list of seconds."""
+    total = 0.0
+    fastest = times[0]
+    slowest = times[0]
+    for seconds in times:
+        total += seconds
+        if seconds < fastest:
+            fastest = seconds
+        elif seconds > slowest:
+            slowest = seconds
+    return total / len(times), fastest, slowest
@@ -40,6 +40,7 @@ class AgentTools:
             
         await self.cache_manager.stop()
         await self.progress_tracker.stop_ui()
+        self.code_analyzer.shutdown()
         self._initialized = False
         self.logger.info("Agent tools shut down")
         
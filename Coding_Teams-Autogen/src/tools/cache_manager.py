@@ -1,4 +1,5 @@
 import asyncio
+import base64
 import json
 import os
 import pickle
@@ -9,9 +10,32 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import logging
 import hashlib
+import heapq
 import threading
 from collections import defaultdict
 
+@dataclass(slots=True)
+class NamespaceStats:
+    hit_count: int = 0
+    miss_count: int = 0
+    total_size: int = 0
+    entry_count: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hit_count": self.hit_count,
+            "miss_count": self.miss_count,
+            "total_size": self.total_size,
+            "entry_count": self.entry_count
+        }
+
+@dataclass(slots=True)
+class _ThreadCounters:
+    hits: int = 0
+    misses: int = 0
+    reads: int = 0
+    writes: int = 0
+
 @dataclass
 class CacheEntry:
     key: str
@@ -48,12 +72,12 @@ class CacheManager:
         self.max_memory_bytes = max_memory_mb * 1024 * 1024
         
         self.memory_cache: Dict[str, CacheEntry] = {}
-        self.namespace_stats: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
-            "hit_count": 0,
-            "miss_count": 0,
-            "total_size": 0,
-            "entry_count": 0
-        })
+        self._disk_mirror: Dict[str, Dict[str, Any]] = {}
+        self._dirty: Set[str] = set()
+        self._tombstones: Set[str] = set()
+        self._mirror_dirty = False
+        self._expiry_heap: list = []
+        self.namespace_stats: Dict[str, NamespaceStats] = {}
         
         self.logger = logging.getLogger("cache_manager")
         self.write_lock = threading.Lock()
@@ -62,11 +86,41 @@ class CacheManager:
         
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
-        self.total_hits = 0
-        self.total_misses = 0
-        self.total_writes = 0
-        self.total_reads = 0
+        self._local = threading.local()
+        self._thread_counters = []
+        self._counters_lock = threading.Lock()
         
+    def _counters(self) -> _ThreadCounters:
+        counters = getattr(self._local, "counters", None)
+        if counters is None:
+            counters = _ThreadCounters()
+            with self._counters_lock:
+                self._thread_counters.append(counters)
+            self._local.counters = counters
+        return counters
+
+    @property
+    def total_hits(self) -> int:
+        return sum(c.hits for c in self._thread_counters)
+
+    @property
+    def total_misses(self) -> int:
+        return sum(c.misses for c in self._thread_counters)
+
+    @property
+    def total_writes(self) -> int:
+        return sum(c.writes for c in self._thread_counters)
+
+    @property
+    def total_reads(self) -> int:
+        return sum(c.reads for c in self._thread_counters)
+
+    def _ns(self, namespace: str) -> NamespaceStats:
+        stats = self.namespace_stats.get(namespace)
+        if stats is None:
+            stats = self.namespace_stats[namespace] = NamespaceStats()
+        return stats
+
     async def start(self):
         if self.running:
             return
@@ -113,8 +167,13 @@ class CacheManager:
         
         with self.write_lock:
             self.memory_cache[full_key] = entry
-            self.namespace_stats[namespace]["entry_count"] += 1
-            self.namespace_stats[namespace]["total_size"] += size_bytes
+            if expires_at:
+                heapq.heappush(self._expiry_heap, (expires_at, full_key))
+            self._dirty.add(full_key)
+            self._tombstones.discard(full_key)
+            stats = self._ns(namespace)
+            stats.entry_count += 1
+            stats.total_size += size_bytes
             
         await self._check_memory_limits()
         self.logger.debug(f"Cached {full_key} with TTL {ttl_seconds}s")
@@ -126,19 +185,19 @@ class CacheManager:
             entry = self.memory_cache.get(full_key)
             
         if entry is None:
-            self.total_misses += 1
-            self.namespace_stats[namespace]["miss_count"] += 1
+            self._counters().misses += 1
+            self._ns(namespace).miss_count += 1
             return None
             
         if entry.is_expired():
             await self.delete(key, namespace)
-            self.total_misses += 1
-            self.namespace_stats[namespace]["miss_count"] += 1
+            self._counters().misses += 1
+            self._ns(namespace).miss_count += 1
             return None
             
         entry.touch()
-        self.total_hits += 1
-        self.namespace_stats[namespace]["hit_count"] += 1
+        self._counters().hits += 1
+        self._ns(namespace).hit_count += 1
         
         self.logger.debug(f"Cache hit for {full_key}")
         return entry.value
@@ -148,26 +207,37 @@ class CacheManager:
         
         with self.write_lock:
             entry = self.memory_cache.pop(full_key, None)
-            
+            if entry:
+                self._dirty.discard(full_key)
+                self._tombstones.add(full_key)
+
         if entry:
-            self.namespace_stats[namespace]["entry_count"] -= 1
-            self.namespace_stats[namespace]["total_size"] -= entry.size_bytes
+            stats = self._ns(namespace)
+            stats.entry_count -= 1
+            stats.total_size -= entry.size_bytes
             self.logger.debug(f"Deleted cache entry {full_key}")
             
     async def clear(self, namespace: str = None):
         with self.write_lock:
             if namespace:
-                keys_to_remove = [k for k in self.memory_cache.keys() if k.startswith(f"{namespace}:")]
+                prefix = f"{namespace}:"
+                keys_to_remove = [k for k in self.memory_cache.keys() if k.startswith(prefix)]
                 for key in keys_to_remove:
                     del self.memory_cache[key]
-                self.namespace_stats[namespace] = {
-                    "hit_count": 0,
-                    "miss_count": 0,
-                    "total_size": 0,
-                    "entry_count": 0
-                }
+                    self._dirty.discard(key)
+                    self._tombstones.add(key)
+                # Mirror-only entries (evicted from memory) must die too, or
+                # they resurrect from disk on the next load.
+                for key in self._disk_mirror:
+                    if key.startswith(prefix):
+                        self._dirty.discard(key)
+                        self._tombstones.add(key)
+                self.namespace_stats[namespace] = NamespaceStats()
                 self.logger.info(f"Cleared cache namespace: {namespace}")
             else:
+                self._tombstones.update(self.memory_cache.keys())
+                self._tombstones.update(self._disk_mirror.keys())
+                self._dirty.clear()
                 self.memory_cache.clear()
                 self.namespace_stats.clear()
                 self.logger.info("Cleared entire cache")
@@ -188,7 +258,7 @@ class CacheManager:
             "total_misses": self.total_misses,
             "total_writes": self.total_writes,
             "total_reads": self.total_reads,
-            "namespace_stats": dict(self.namespace_stats),
+            "namespace_stats": {ns: stats.to_dict() for ns, stats in self.namespace_stats.items()},
             "write_cycle_minutes": self.write_cycle_minutes,
             "running": self.running
         }
@@ -204,41 +274,55 @@ class CacheManager:
             except Exception as e:
                 self.logger.error(f"Error in write cycle: {e}")
                 
+    def _serialize_entry(self, entry: CacheEntry) -> Dict[str, Any]:
+        return {
+            "value": self._serialize_value(entry.value),
+            "namespace": entry.namespace,
+            "created_at": entry.created_at.isoformat(),
+            "expires_at": entry.expires_at.isoformat() if entry.expires_at else None,
+            "access_count": entry.access_count,
+            "last_accessed": entry.last_accessed.isoformat(),
+            "size_bytes": entry.size_bytes
+        }
+
+    @staticmethod
+    def _atomic_write(file_path: Path, data: bytes):
+        tmp_path = file_path.with_suffix(file_path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, file_path)
+
     async def flush_to_disk(self):
-        if not self.memory_cache:
+        if not self._dirty and not self._tombstones and not self._mirror_dirty:
             return
-            
+
         try:
-            cache_data = {}
-            stats_data = {}
-            
             with self.write_lock:
-                for full_key, entry in self.memory_cache.items():
-                    if not entry.is_expired():
-                        cache_data[full_key] = {
-                            "value": self._serialize_value(entry.value),
-                            "namespace": entry.namespace,
-                            "created_at": entry.created_at.isoformat(),
-                            "expires_at": entry.expires_at.isoformat() if entry.expires_at else None,
-                            "access_count": entry.access_count,
-                            "last_accessed": entry.last_accessed.isoformat(),
-                            "size_bytes": entry.size_bytes
-                        }
-                        
-                stats_data = dict(self.namespace_stats)
-                
+                for full_key in self._dirty:
+                    entry = self.memory_cache.get(full_key)
+                    if entry is None or entry.is_expired():
+                        self._disk_mirror.pop(full_key, None)
+                    else:
+                        self._disk_mirror[full_key] = self._serialize_entry(entry)
+
+                for full_key in self._tombstones:
+                    self._disk_mirror.pop(full_key, None)
+
+                flushed_count = len(self._dirty)
+                self._dirty.clear()
+                self._tombstones.clear()
+                self._mirror_dirty = False
+                stats_data = {ns: stats.to_dict() for ns, stats in self.namespace_stats.items()}
+
             cache_file = self.cache_dir / "cache_data.json"
             stats_file = self.cache_dir / "cache_stats.json"
-            
-            with open(cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
-                
-            with open(stats_file, 'w') as f:
-                json.dump(stats_data, f, indent=2)
-                
-            self.total_writes += 1
-            self.logger.info(f"Flushed {len(cache_data)} entries to disk")
-            
+
+            self._atomic_write(cache_file, json.dumps(self._disk_mirror, indent=2).encode('utf-8'))
+            self._atomic_write(stats_file, json.dumps(stats_data, indent=2).encode('utf-8'))
+
+            self._counters().writes += 1
+            self.logger.info(f"Flushed {flushed_count} dirty entries to disk")
+
         except Exception as e:
             self.logger.error(f"Error flushing cache to disk: {e}")
             
@@ -271,6 +355,9 @@ class CacheManager:
                         
                         if not entry.is_expired():
                             self.memory_cache[full_key] = entry
+                            if entry.expires_at:
+                                heapq.heappush(self._expiry_heap, (entry.expires_at, full_key))
+                            self._disk_mirror[full_key] = entry_data
                             loaded_count += 1
                             
                     except Exception as e:
@@ -281,9 +368,10 @@ class CacheManager:
             if stats_file.exists():
                 with open(stats_file, 'r') as f:
                     stats_data = json.load(f)
-                    self.namespace_stats.update(stats_data)
+                    for namespace, stats in stats_data.items():
+                        self.namespace_stats[namespace] = NamespaceStats(**stats)
                     
-            self.total_reads += 1
+            self._counters().reads += 1
             
         except Exception as e:
             self.logger.error(f"Error loading cache from disk: {e}")
@@ -313,12 +401,17 @@ class CacheManager:
                 
             with self.write_lock:
                 if full_key in self.memory_cache:
+                    if full_key in self._dirty:
+                        self._disk_mirror[full_key] = self._serialize_entry(entry)
+                        self._dirty.discard(full_key)
+                        self._mirror_dirty = True
                     del self.memory_cache[full_key]
                     current_size -= entry.size_bytes
                     evicted_count += 1
                     
-                    self.namespace_stats[entry.namespace]["entry_count"] -= 1
-                    self.namespace_stats[entry.namespace]["total_size"] -= entry.size_bytes
+                    stats = self._ns(entry.namespace)
+                    stats.entry_count -= 1
+                    stats.total_size -= entry.size_bytes
                     
         if evicted_count > 0:
             self.logger.info(f"Evicted {evicted_count} LRU entries to free memory")
@@ -331,11 +424,17 @@ class CacheManager:
                 return json.dumps(value, default=str)
         except (TypeError, ValueError):
             try:
-                return pickle.dumps(value).hex()
+                return "b64:" + base64.b64encode(pickle.dumps(value)).decode('ascii')
             except Exception:
                 return str(value)
-                
+
     def _deserialize_value(self, serialized: str) -> Any:
+        if isinstance(serialized, str) and serialized.startswith("b64:"):
+            try:
+                return pickle.loads(base64.b64decode(serialized[4:]))
+            except Exception:
+                return serialized
+
         try:
             return json.loads(serialized)
         except (json.JSONDecodeError, TypeError):
@@ -345,17 +444,20 @@ class CacheManager:
                 return serialized
                 
     async def cleanup_expired_entries(self):
+        now = datetime.now()
         expired_keys = []
-        
+
         with self.write_lock:
-            for full_key, entry in self.memory_cache.items():
-                if entry.is_expired():
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                expires_at, full_key = heapq.heappop(self._expiry_heap)
+                entry = self.memory_cache.get(full_key)
+                if entry is not None and entry.expires_at == expires_at:
                     expired_keys.append(full_key)
-                    
+
         for full_key in expired_keys:
-            namespace = full_key.split(":", 1)[0]
-            await self.delete(full_key.split(":", 1)[1], namespace)
-            
+            namespace, key = full_key.split(":", 1)
+            await self.delete(key, namespace)
+
         if expired_keys:
             self.logger.info(f"Cleaned up {len(expired_keys)} expired entries")
             
@@ -6,8 +6,13 @@ from dataclasses import dataclass
 from pathlib import Path
 import asyncio
 import aiofiles
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 
+def _chunk_worker(text: str, metadata: Optional[Dict[str, Any]], max_chunk_size: int, overlap_size: int) -> List[Dict[str, Any]]:
+    worker = ChunkingManager(max_chunk_size=max_chunk_size, overlap_size=overlap_size)
+    return [chunk.to_dict() for chunk in worker.chunk_text(text, metadata)]
+
 @dataclass
 class Chunk:
     id: str
@@ -32,7 +37,31 @@ class ChunkingManager:
         self.max_chunk_size = max_chunk_size
         self.overlap_size = overlap_size
         self.chunks: Dict[str, Chunk] = {}
-        
+        self._meta_index: Dict[Tuple[str, Any], set] = {}
+
+    def _register_chunk(self, chunk: Chunk):
+        existing = self.chunks.get(chunk.id)
+        if existing is not None:
+            self._unregister_chunk(existing)
+        self.chunks[chunk.id] = chunk
+        for key, value in chunk.metadata.items():
+            try:
+                self._meta_index.setdefault((key, value), set()).add(chunk.id)
+            except TypeError:
+                continue
+
+    def _unregister_chunk(self, chunk: Chunk):
+        self.chunks.pop(chunk.id, None)
+        for key, value in chunk.metadata.items():
+            try:
+                chunk_ids = self._meta_index.get((key, value))
+            except TypeError:
+                continue
+            if chunk_ids is not None:
+                chunk_ids.discard(chunk.id)
+                if not chunk_ids:
+                    del self._meta_index[(key, value)]
+
     def create_chunk_id(self, content: str, metadata: Dict[str, Any] = None) -> str:
         content_hash = hashlib.md5(content.encode()).hexdigest()[:8]
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -49,7 +78,7 @@ class ChunkingManager:
                 hash=hashlib.md5(text.encode()).hexdigest(),
                 created_at=datetime.now()
             )
-            self.chunks[chunk_id] = chunk
+            self._register_chunk(chunk)
             return [chunk]
         
         chunks = []
@@ -84,13 +113,42 @@ class ChunkingManager:
             )
             
             chunks.append(chunk)
-            self.chunks[chunk_id] = chunk
+            self._register_chunk(chunk)
             
             start = end - self.overlap_size if end < len(text) else end
             chunk_num += 1
             
         return chunks
         
+    async def chunk_many(self, items: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[List[Chunk]]:
+        if not items:
+            return []
+
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor() as pool:
+            results = await asyncio.gather(*[
+                loop.run_in_executor(pool, _chunk_worker, text, metadata, self.max_chunk_size, self.overlap_size)
+                for text, metadata in items
+            ])
+
+        all_chunks = []
+        for chunk_dicts in results:
+            chunks = []
+            for chunk_data in chunk_dicts:
+                chunk = Chunk(
+                    id=chunk_data["id"],
+                    content=chunk_data["content"],
+                    metadata=chunk_data["metadata"],
+                    size=chunk_data["size"],
+                    hash=chunk_data["hash"],
+                    created_at=datetime.fromisoformat(chunk_data["created_at"])
+                )
+                self._register_chunk(chunk)
+                chunks.append(chunk)
+            all_chunks.append(chunks)
+
+        return all_chunks
+
     def chunk_code(self, code: str, language: str = "python", metadata: Dict[str, Any] = None) -> List[Chunk]:
         if language.lower() == "python":
             return self._chunk_python_code(code, metadata)
@@ -133,7 +191,7 @@ class ChunkingManager:
                         created_at=datetime.now()
                     )
                     chunks.append(chunk)
-                    self.chunks[chunk_id] = chunk
+                    self._register_chunk(chunk)
                     
                     current_chunk = []
                     current_size = 0
@@ -174,7 +232,7 @@ class ChunkingManager:
                 created_at=datetime.now()
             )
             chunks.append(chunk)
-            self.chunks[chunk_id] = chunk
+            self._register_chunk(chunk)
             
         return chunks
         
@@ -210,7 +268,7 @@ class ChunkingManager:
                         created_at=datetime.now()
                     )
                     chunks.append(chunk)
-                    self.chunks[chunk_id] = chunk
+                    self._register_chunk(chunk)
                     
                     current_chunk = []
                     current_size = 0
@@ -241,7 +299,7 @@ class ChunkingManager:
                 created_at=datetime.now()
             )
             chunks.append(chunk)
-            self.chunks[chunk_id] = chunk
+            self._register_chunk(chunk)
             
         return chunks
         
@@ -249,11 +307,16 @@ class ChunkingManager:
         return self.chunks.get(chunk_id)
         
     def get_chunks_by_metadata(self, metadata_filter: Dict[str, Any]) -> List[Chunk]:
-        matching_chunks = []
-        for chunk in self.chunks.values():
-            if all(chunk.metadata.get(key) == value for key, value in metadata_filter.items()):
-                matching_chunks.append(chunk)
-        return matching_chunks
+        if not metadata_filter:
+            return list(self.chunks.values())
+
+        try:
+            id_sets = [self._meta_index.get((key, value), set()) for key, value in metadata_filter.items()]
+        except TypeError:
+            return []
+
+        matching_ids = set.intersection(*id_sets) if id_sets else set()
+        return [self.chunks[chunk_id] for chunk_id in matching_ids]
         
     def merge_chunks(self, chunk_ids: List[str]) -> Optional[str]:
         chunks = [self.chunks.get(chunk_id) for chunk_id in chunk_ids]
@@ -292,7 +355,7 @@ class ChunkingManager:
                     hash=chunk_data["hash"],
                     created_at=datetime.fromisoformat(chunk_data["created_at"])
                 )
-                self.chunks[chunk_id] = chunk
+                self._register_chunk(chunk)
             return True
         except Exception:
             return False
@@ -300,13 +363,13 @@ class ChunkingManager:
     def cleanup_old_chunks(self, max_age_hours: int = 24):
         cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
         expired_chunks = [
-            chunk_id for chunk_id, chunk in self.chunks.items()
+            chunk for chunk in self.chunks.values()
             if chunk.created_at < cutoff_time
         ]
-        
-        for chunk_id in expired_chunks:
-            del self.chunks[chunk_id]
-            
+
+        for chunk in expired_chunks:
+            self._unregister_chunk(chunk)
+
         return len(expired_chunks)
         
     def get_stats(self) -> Dict[str, Any]:
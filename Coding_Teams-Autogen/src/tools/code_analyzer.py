@@ -1,15 +1,82 @@
 import ast
+import asyncio
 import re
 import os
 import json
+import mmap
+import pickle
+import sys
 from typing import Dict, List, Any, Optional, Tuple, Set
 from dataclasses import dataclass, field
 from pathlib import Path
 import logging
-from collections import defaultdict
+from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
 import hashlib
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+from operator import attrgetter
 
-@dataclass
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+    _HAVE_NUMBA = np is not None
+except ImportError:
+    _HAVE_NUMBA = False
+
+try:
+    from blake3 import blake3 as _content_hash
+except ImportError:
+    _content_hash = hashlib.sha256
+
+if _HAVE_NUMBA:
+    @njit(cache=True)
+    def _count_lines_bytes(buf, comment_byte):
+        code_lines = 0
+        comment_lines = 0
+        blank_lines = 0
+
+        i = 0
+        n = buf.size
+        while i < n:
+            j = i
+            first = -1
+            while j < n and buf[j] != 0x0A:
+                b = buf[j]
+                if first == -1 and b != 0x20 and b != 0x09 and b != 0x0D:
+                    first = b
+                j += 1
+
+            if first == -1:
+                blank_lines += 1
+            elif first == comment_byte:
+                comment_lines += 1
+            else:
+                code_lines += 1
+
+            i = j + 1
+
+        return code_lines, comment_lines, blank_lines
+
+_TYPE_FUNCTION = sys.intern("function")
+_TYPE_CLASS = sys.intern("class")
+
+_JS_IMPORT_RE = re.compile(r'import\s+.*?\s+from\s+[\'"]([^\'"]+)[\'"]')
+_JS_REQUIRE_RE = re.compile(r'require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)')
+_JS_FUNCTION_RE = re.compile(r'function\s+(\w+)\s*\([^)]*\)\s*\{|(\w+)\s*=\s*\([^)]*\)\s*=>\s*\{')
+_JS_CLASS_RE = re.compile(r'class\s+(\w+)(?:\s+extends\s+\w+)?\s*\{')
+
+_CE_FIELDS = ("name", "type", "file_path", "line_start", "line_end", "docstring",
+              "parameters", "return_type", "decorators", "parent_class",
+              "complexity", "dependencies", "code_snippet")
+_CE_GETTER = attrgetter(*_CE_FIELDS)
+
+@dataclass(slots=True)
 class CodeElement:
     name: str
     type: str
@@ -24,25 +91,25 @@ class CodeElement:
     complexity: int = 0
     dependencies: List[str] = field(default_factory=list)
     code_snippet: str = ""
-    
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "name": self.name,
-            "type": self.type,
-            "file_path": self.file_path,
-            "line_start": self.line_start,
-            "line_end": self.line_end,
-            "docstring": self.docstring,
-            "parameters": self.parameters,
-            "return_type": self.return_type,
-            "decorators": self.decorators,
-            "parent_class": self.parent_class,
-            "complexity": self.complexity,
-            "dependencies": self.dependencies,
-            "code_snippet": self.code_snippet
-        }
+        return dict(zip(_CE_FIELDS, _CE_GETTER(self)))
 
-@dataclass
+    def get_code_snippet(self) -> str:
+        if not self.code_snippet:
+            if self.line_start <= 0:
+                # Regex-extracted elements (JS/TS) carry no line numbers;
+                # re-reading the file would yield an empty slice every call.
+                return ""
+            try:
+                with open(self.file_path, 'r') as f:
+                    lines = f.read().splitlines()
+            except OSError:
+                return ""
+            self.code_snippet = '\n'.join(lines[self.line_start - 1:self.line_end])
+        return self.code_snippet
+
+@dataclass(slots=True)
 class FileAnalysis:
     file_path: str
     language: str
@@ -71,12 +138,156 @@ class FileAnalysis:
             "last_modified": self.last_modified
         }
 
+def _count_lines(lines: List[str], comment_prefixes: tuple) -> Tuple[int, int, int]:
+    code_lines = 0
+    comment_lines = 0
+    blank_lines = 0
+
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            blank_lines += 1
+        elif stripped.startswith(comment_prefixes):
+            comment_lines += 1
+        else:
+            code_lines += 1
+
+    return code_lines, comment_lines, blank_lines
+
+def _count_python_lines(content: str, lines: List[str]) -> Tuple[int, int, int]:
+    if _HAVE_NUMBA:
+        buf = np.frombuffer(content.encode('utf-8'), dtype=np.uint8)
+        return _count_lines_bytes(buf, 0x23)
+    return _count_lines(lines, ('#',))
+
+def _analyze_python_source(path_str: str, content: str, lines: List[str], analysis: FileAnalysis):
+    analysis.code_lines, analysis.comment_lines, analysis.blank_lines = \
+        _count_python_lines(content, lines)
+
+    try:
+        tree = ast.parse(content)
+
+        visitor = PythonSourceVisitor(path_str)
+        visitor.visit(tree)
+        analysis.imports = list(visitor.imports)
+        analysis.classes = visitor.classes
+        analysis.functions = visitor.functions
+
+        analysis.complexity_score = sum(f.complexity for f in analysis.functions) + \
+                                  sum(c.complexity for c in analysis.classes)
+
+    except SyntaxError as e:
+        logging.getLogger("code_analyzer").warning(f"Syntax error in {path_str}: {e}")
+
+def _analyze_js_source(path_str: str, content: str, lines: List[str], analysis: FileAnalysis):
+    analysis.code_lines, analysis.comment_lines, analysis.blank_lines = \
+        _count_lines(lines, ('//', '/*'))
+
+    analysis.imports = list(dict.fromkeys(_JS_IMPORT_RE.findall(content) + _JS_REQUIRE_RE.findall(content)))
+
+    functions = [declared or arrow for declared, arrow in _JS_FUNCTION_RE.findall(content)]
+
+    for func_name in functions:
+        element = CodeElement(
+            name=func_name,
+            type=_TYPE_FUNCTION,
+            file_path=path_str,
+            line_start=0,
+            line_end=0
+        )
+        analysis.functions.append(element)
+
+    classes = _JS_CLASS_RE.findall(content)
+
+    for class_name in classes:
+        element = CodeElement(
+            name=class_name,
+            type=_TYPE_CLASS,
+            file_path=path_str,
+            line_start=0,
+            line_end=0
+        )
+        analysis.classes.append(element)
+
+def _count_generic_lines_np(content: str) -> Tuple[int, int, int]:
+    buf = np.frombuffer(content.encode('utf-8'), dtype=np.uint8)
+    if buf.size == 0:
+        return 0, 0, 0
+
+    nl = np.flatnonzero(buf == 0x0A)
+    line_starts = np.concatenate(([0], nl + 1))
+    line_ends = np.concatenate((nl, [buf.size]))
+    if line_starts[-1] == buf.size:
+        line_starts = line_starts[:-1]
+        line_ends = line_ends[:-1]
+
+    nonws = np.flatnonzero((buf != 0x20) & (buf != 0x09) & (buf != 0x0D) & (buf != 0x0A))
+    if nonws.size == 0:
+        return 0, 0, len(line_starts)
+
+    idx = np.searchsorted(nonws, line_starts)
+    # Lines starting after the last non-whitespace byte have no match; clamping
+    # the lookup would classify them by a byte from an earlier line.
+    in_range = idx < nonws.size
+    first_pos = nonws[np.minimum(idx, nonws.size - 1)]
+    nonblank = in_range & (first_pos < line_ends)
+    blank_lines = int(np.count_nonzero(~nonblank))
+
+    first = buf[first_pos]
+    second = buf[np.minimum(first_pos + 1, buf.size - 1)]
+    slash_pair = (first == 0x2F) & ((second == 0x2F) | (second == 0x2A)) & (first_pos + 1 < line_ends)
+    is_comment = nonblank & ((first == 0x23) | (first == 0x2A) | slash_pair)
+    comment_lines = int(np.count_nonzero(is_comment))
+    code_lines = int(np.count_nonzero(nonblank)) - comment_lines
+
+    return code_lines, comment_lines, blank_lines
+
+def _analyze_generic_source(content: str, lines: List[str], analysis: FileAnalysis):
+    if np is not None:
+        counts = _count_generic_lines_np(content)
+    else:
+        counts = _count_lines(lines, ('//', '#', '/*', '*'))
+    analysis.code_lines, analysis.comment_lines, analysis.blank_lines = counts
+
+def _analyze_source(path_str: str, content: str, language: str) -> FileAnalysis:
+    path_str = sys.intern(path_str)
+    lines = content.splitlines()
+    analysis = FileAnalysis(
+        file_path=path_str,
+        language=language,
+        total_lines=len(lines),
+        code_lines=0,
+        comment_lines=0,
+        blank_lines=0
+    )
+
+    if language == 'python':
+        _analyze_python_source(path_str, content, lines, analysis)
+    elif language in ['javascript', 'typescript']:
+        _analyze_js_source(path_str, content, lines, analysis)
+    else:
+        _analyze_generic_source(content, lines, analysis)
+
+    return analysis
+
 class CodeAnalyzer:
-    def __init__(self, workspace_path: str = "./workspace"):
+    def __init__(self, workspace_path: str = "./workspace", analysis_cache_dir: str = None):
         self.workspace_path = Path(workspace_path)
         self.logger = logging.getLogger("code_analyzer")
         self.file_analyses: Dict[str, FileAnalysis] = {}
         self.code_index: Dict[str, List[CodeElement]] = defaultdict(list)
+        self._functions_by_name: Dict[str, List[CodeElement]] = defaultdict(list)
+        self._classes_by_name: Dict[str, List[CodeElement]] = defaultdict(list)
+        self._deps_reverse: Dict[str, List[CodeElement]] = defaultdict(list)
+        self._file_elements: Dict[str, List[CodeElement]] = {}
+
+        if analysis_cache_dir is None:
+            analysis_cache_dir = Path.home() / ".cache" / "code_analyzer" / "ast"
+        self.analysis_cache_dir = Path(analysis_cache_dir)
+        self.analysis_cache_dir.mkdir(parents=True, exist_ok=True)
+        self._stat_cache: Dict[str, Tuple[float, int, str]] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._line_offset_cache: Dict[str, Tuple[float, array]] = {}
         
         self.supported_extensions = {
             '.py': 'python',
@@ -98,144 +309,128 @@ class CodeAnalyzer:
         
     def get_file_language(self, file_path: Path) -> Optional[str]:
         return self.supported_extensions.get(file_path.suffix.lower())
-        
-    async def analyze_file(self, file_path: Path) -> Optional[FileAnalysis]:
-        if not file_path.exists():
+
+    def _cache_key(self, content_bytes: bytes, language: str) -> str:
+        digest = _content_hash(content_bytes).hexdigest()
+        return f"{digest}-{language}-py{sys.version_info[0]}{sys.version_info[1]}"
+
+    def _load_cached_analysis(self, cache_key: str) -> Optional[FileAnalysis]:
+        cache_path = self.analysis_cache_dir / f"{cache_key}.pkl"
+        if not cache_path.exists():
             return None
-            
-        language = self.get_file_language(file_path)
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            self.logger.warning(f"Error loading cached analysis {cache_key}: {e}")
+            return None
+
+    def _store_cached_analysis(self, cache_key: str, analysis: FileAnalysis):
+        cache_path = self.analysis_cache_dir / f"{cache_key}.pkl"
+        try:
+            with open(cache_path, 'wb') as f:
+                pickle.dump(analysis, f)
+        except Exception as e:
+            self.logger.warning(f"Error caching analysis {cache_key}: {e}")
+
+    async def analyze_file(self, file_path, language: str = None) -> Optional[FileAnalysis]:
+        path_str = os.fspath(file_path)
+
+        if language is None:
+            language = self.supported_extensions.get(os.path.splitext(path_str)[1].lower())
         if not language:
             return None
-            
+
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            analysis = FileAnalysis(
-                file_path=str(file_path),
-                language=language,
-                total_lines=len(content.splitlines()),
-                code_lines=0,
-                comment_lines=0,
-                blank_lines=0,
-                last_modified=str(file_path.stat().st_mtime)
-            )
-            
-            if language == 'python':
-                await self._analyze_python_file(file_path, content, analysis)
-            elif language in ['javascript', 'typescript']:
-                await self._analyze_js_file(file_path, content, analysis)
+            try:
+                stat = os.stat(path_str)
+            except OSError:
+                return None
+
+            content_bytes = None
+            cached_stat = self._stat_cache.get(path_str)
+            if cached_stat and cached_stat[0] == stat.st_mtime and cached_stat[1] == stat.st_size:
+                cache_key = cached_stat[2]
             else:
-                await self._analyze_generic_file(file_path, content, analysis)
-                
-            self.file_analyses[str(file_path)] = analysis
+                with open(path_str, 'rb') as f:
+                    content_bytes = f.read()
+                cache_key = self._cache_key(content_bytes, language)
+                self._stat_cache[path_str] = (stat.st_mtime, stat.st_size, cache_key)
+
+            analysis = self._load_cached_analysis(cache_key)
+            if analysis is not None and analysis.file_path != path_str:
+                analysis.file_path = path_str
+                for element in analysis.functions + analysis.classes:
+                    element.file_path = path_str
+
+            if analysis is None:
+                if content_bytes is None:
+                    with open(path_str, 'rb') as f:
+                        content_bytes = f.read()
+                content = content_bytes.decode('utf-8')
+
+                loop = asyncio.get_running_loop()
+                analysis = await loop.run_in_executor(
+                    self._get_pool(), _analyze_source, path_str, content, language
+                )
+
+                self._store_cached_analysis(cache_key, analysis)
+
+            analysis.last_modified = str(stat.st_mtime)
+            self.file_analyses[path_str] = analysis
             self._update_code_index(analysis)
-            
+
             return analysis
-            
+
         except Exception as e:
             self.logger.error(f"Error analyzing file {file_path}: {e}")
             return None
             
-    async def _analyze_python_file(self, file_path: Path, content: str, analysis: FileAnalysis):
-        lines = content.splitlines()
-        
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                analysis.blank_lines += 1
-            elif stripped.startswith('#'):
-                analysis.comment_lines += 1
-            else:
-                analysis.code_lines += 1
-                
-        try:
-            tree = ast.parse(content)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        analysis.imports.append(alias.name)
-                elif isinstance(node, ast.ImportFrom):
-                    module = node.module or ""
-                    for alias in node.names:
-                        analysis.imports.append(f"{module}.{alias.name}")
-                        
-            class_visitor = PythonClassVisitor(file_path, content)
-            class_visitor.visit(tree)
-            analysis.classes = class_visitor.classes
-            
-            function_visitor = PythonFunctionVisitor(file_path, content)
-            function_visitor.visit(tree)
-            analysis.functions = function_visitor.functions
-            
-            analysis.complexity_score = sum(f.complexity for f in analysis.functions) + \
-                                      sum(c.complexity for c in analysis.classes)
-                                      
-        except SyntaxError as e:
-            self.logger.warning(f"Syntax error in {file_path}: {e}")
-            
-    async def _analyze_js_file(self, file_path: Path, content: str, analysis: FileAnalysis):
-        lines = content.splitlines()
-        
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                analysis.blank_lines += 1
-            elif stripped.startswith('//') or stripped.startswith('/*'):
-                analysis.comment_lines += 1
-            else:
-                analysis.code_lines += 1
-                
-        import_pattern = r'import\s+.*?\s+from\s+[\'"]([^\'"]+)[\'"]'
-        require_pattern = r'require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)'
-        
-        imports = re.findall(import_pattern, content) + re.findall(require_pattern, content)
-        analysis.imports = imports
-        
-        function_pattern = r'function\s+(\w+)\s*\([^)]*\)\s*\{'
-        arrow_function_pattern = r'(\w+)\s*=\s*\([^)]*\)\s*=>\s*\{'
-        
-        functions = re.findall(function_pattern, content) + re.findall(arrow_function_pattern, content)
-        
-        for func_name in functions:
-            element = CodeElement(
-                name=func_name,
-                type="function",
-                file_path=str(file_path),
-                line_start=0,
-                line_end=0
-            )
-            analysis.functions.append(element)
-            
-        class_pattern = r'class\s+(\w+)(?:\s+extends\s+\w+)?\s*\{'
-        classes = re.findall(class_pattern, content)
-        
-        for class_name in classes:
-            element = CodeElement(
-                name=class_name,
-                type="class",
-                file_path=str(file_path),
-                line_start=0,
-                line_end=0
-            )
-            analysis.classes.append(element)
-            
-    async def _analyze_generic_file(self, file_path: Path, content: str, analysis: FileAnalysis):
-        lines = content.splitlines()
-        
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                analysis.blank_lines += 1
-            elif any(stripped.startswith(comment) for comment in ['//', '#', '/*', '*']):
-                analysis.comment_lines += 1
-            else:
-                analysis.code_lines += 1
-                
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor()
+        return self._pool
+
+    def shutdown(self) -> None:
+        """Release the worker pool; the analyzer stays usable and will lazily recreate it."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _remove_file_elements(self, file_path: str):
+        old_elements = self._file_elements.pop(file_path, None)
+        if not old_elements:
+            return
+
+        for element in old_elements:
+            for index, key in ((self.code_index, element.name),
+                               (self._functions_by_name, element.name),
+                               (self._classes_by_name, element.name)):
+                bucket = index.get(key)
+                if bucket and element in bucket:
+                    bucket.remove(element)
+                    if not bucket:
+                        del index[key]
+            for dependency in element.dependencies:
+                bucket = self._deps_reverse.get(dependency)
+                if bucket and element in bucket:
+                    bucket.remove(element)
+                    if not bucket:
+                        del self._deps_reverse[dependency]
+
     def _update_code_index(self, analysis: FileAnalysis):
-        for element in analysis.functions + analysis.classes:
+        self._remove_file_elements(analysis.file_path)
+        elements = analysis.functions + analysis.classes
+        self._file_elements[analysis.file_path] = elements
+
+        for element in elements:
             self.code_index[element.name].append(element)
+            if element.type == "function":
+                self._functions_by_name[element.name].append(element)
+            elif element.type == "class":
+                self._classes_by_name[element.name].append(element)
+            for dependency in element.dependencies:
+                self._deps_reverse[dependency].append(element)
             
     async def analyze_directory(self, directory_path: Path = None) -> Dict[str, FileAnalysis]:
         if directory_path is None:
@@ -243,43 +438,67 @@ class CodeAnalyzer:
             
         if not directory_path.exists():
             return {}
-            
-        analyses = {}
-        
-        for file_path in directory_path.rglob('*'):
-            if file_path.is_file() and self.get_file_language(file_path):
-                analysis = await self.analyze_file(file_path)
-                if analysis:
-                    analyses[str(file_path)] = analysis
-                    
-        return analyses
+
+        candidates = list(self._iter_source_files(directory_path))
+
+        results = await asyncio.gather(*(
+            self.analyze_file(file_path, language=language)
+            for file_path, language in candidates
+        ))
+
+        return {
+            file_path: analysis
+            for (file_path, _), analysis in zip(candidates, results)
+            if analysis
+        }
+
+    def _iter_source_files(self, root: Path):
+        stack = [str(root)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError as e:
+                self.logger.warning(f"Error scanning directory: {e}")
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        ext = os.path.splitext(entry.name)[1].lower()
+                        language = self.supported_extensions.get(ext)
+                        if language:
+                            yield entry.path, language
         
     def find_function(self, function_name: str) -> List[CodeElement]:
-        return [elem for elem in self.code_index.get(function_name, []) if elem.type == "function"]
-        
+        return list(self._functions_by_name.get(function_name, []))
+
     def find_class(self, class_name: str) -> List[CodeElement]:
-        return [elem for elem in self.code_index.get(class_name, []) if elem.type == "class"]
+        return list(self._classes_by_name.get(class_name, []))
         
-    def find_by_pattern(self, pattern: str) -> List[CodeElement]:
-        regex = re.compile(pattern, re.IGNORECASE)
+    def find_by_pattern(self, pattern: str, search_snippets: bool = False, literal: bool = False) -> List[CodeElement]:
         results = []
-        
+
+        if literal:
+            pat_lower = pattern.lower()
+            for elements in self.code_index.values():
+                for element in elements:
+                    if pat_lower in element.name.lower() or \
+                            (search_snippets and pat_lower in element.get_code_snippet().lower()):
+                        results.append(element)
+            return results
+
+        regex = re.compile(pattern, re.IGNORECASE)
         for elements in self.code_index.values():
             for element in elements:
-                if regex.search(element.name) or regex.search(element.code_snippet):
+                if regex.search(element.name) or \
+                        (search_snippets and regex.search(element.get_code_snippet())):
                     results.append(element)
-                    
+
         return results
         
     def find_dependencies(self, element_name: str) -> List[CodeElement]:
-        dependencies = []
-        
-        for elements in self.code_index.values():
-            for element in elements:
-                if element_name in element.dependencies:
-                    dependencies.append(element)
-                    
-        return dependencies
+        return list(self._deps_reverse.get(element_name, []))
         
     def get_file_summary(self, file_path: str) -> Optional[Dict[str, Any]]:
         analysis = self.file_analyses.get(file_path)
@@ -307,10 +526,9 @@ class CodeAnalyzer:
         total_classes = sum(len(a.classes) for a in self.file_analyses.values())
         total_complexity = sum(a.complexity_score for a in self.file_analyses.values())
         
-        languages = defaultdict(int)
-        for analysis in self.file_analyses.values():
-            languages[analysis.language] += 1
-            
+        languages = Counter(a.language for a in self.file_analyses.values())
+
+
         return {
             "total_files": total_files,
             "total_lines": total_lines,
@@ -321,51 +539,91 @@ class CodeAnalyzer:
             "average_complexity_per_file": total_complexity / total_files if total_files > 0 else 0
         }
         
+    def _file_line_offsets(self, file_path: str, mm: mmap.mmap) -> array:
+        mtime = os.path.getmtime(file_path)
+        cached = self._line_offset_cache.get(file_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        offsets = array('Q', [0])
+        pos = mm.find(b'\n')
+        while pos != -1:
+            offsets.append(pos + 1)
+            pos = mm.find(b'\n', pos + 1)
+
+        self._line_offset_cache[file_path] = (mtime, offsets)
+        return offsets
+
     def search_code_snippets(self, query: str, file_extensions: List[str] = None) -> List[Dict[str, Any]]:
         results = []
-        
+        pattern = re.compile(re.escape(query).encode('utf-8'), re.IGNORECASE)
+
         for file_path, analysis in self.file_analyses.items():
             if file_extensions and not any(file_path.endswith(ext) for ext in file_extensions):
                 continue
-                
+
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                lines = content.splitlines()
-                
-                for i, line in enumerate(lines, 1):
-                    if query.lower() in line.lower():
-                        context_start = max(0, i - 3)
-                        context_end = min(len(lines), i + 3)
-                        context = lines[context_start:context_end]
-                        
-                        results.append({
-                            "file_path": file_path,
-                            "line_number": i,
-                            "line_content": line.strip(),
-                            "context": context,
-                            "language": analysis.language
-                        })
-                        
+                with open(file_path, 'rb') as f:
+                    try:
+                        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    except ValueError:
+                        continue
+
+                    with mm:
+                        size = mm.size()
+                        offsets = self._file_line_offsets(file_path, mm)
+                        total_lines = len(offsets) - 1 if offsets[-1] == size else len(offsets)
+
+                        last_line_number = None
+                        for match in pattern.finditer(mm):
+                            line_number = bisect_right(offsets, match.start())
+                            if line_number == last_line_number:
+                                continue
+                            last_line_number = line_number
+
+                            line_start = offsets[line_number - 1]
+                            line_end = offsets[line_number] - 1 if line_number < len(offsets) else size
+                            line_content = mm[line_start:line_end].decode('utf-8', errors='replace')
+
+                            context_start = max(0, line_number - 3)
+                            context_end = min(total_lines, line_number + 3)
+                            context_stop = offsets[context_end] if context_end < len(offsets) else size
+                            context_bytes = mm[offsets[context_start]:context_stop]
+                            context = context_bytes.decode('utf-8', errors='replace').splitlines()
+
+                            results.append({
+                                "file_path": file_path,
+                                "line_number": line_number,
+                                "line_content": line_content.strip(),
+                                "context": context,
+                                "language": analysis.language
+                            })
+
             except Exception as e:
                 self.logger.error(f"Error searching in {file_path}: {e}")
-                
+
         return results
         
     async def save_analysis_report(self, output_path: str):
-        report = {
-            "timestamp": str(datetime.now()),
-            "project_summary": self.get_project_summary(),
-            "file_analyses": {path: analysis.to_dict() for path, analysis in self.file_analyses.items()},
-            "code_index_summary": {
-                name: len(elements) for name, elements in self.code_index.items()
-            }
-        }
-        
         try:
             with open(output_path, 'w') as f:
-                json.dump(report, f, indent=2)
+                f.write('{\n"timestamp": ')
+                json.dump(str(datetime.now()), f)
+                f.write(',\n"project_summary": ')
+                json.dump(self.get_project_summary(), f, indent=2)
+                f.write(',\n"file_analyses": {')
+                first = True
+                for path, analysis in self.file_analyses.items():
+                    if not first:
+                        f.write(',')
+                    first = False
+                    f.write('\n')
+                    json.dump(path, f)
+                    f.write(': ')
+                    json.dump(analysis.to_dict(), f, indent=2)
+                f.write('\n},\n"code_index_summary": ')
+                json.dump({name: len(elements) for name, elements in self.code_index.items()}, f, indent=2)
+                f.write('\n}\n')
             self.logger.info(f"Analysis report saved to {output_path}")
             return True
         except Exception as e:
@@ -397,107 +655,96 @@ class CodeAnalyzer:
             "classes_with_docstrings": len([c for c in all_classes if c.docstring])
         }
 
-class PythonClassVisitor(ast.NodeVisitor):
-    def __init__(self, file_path: Path, content: str):
-        self.file_path = file_path
-        self.content = content
-        self.lines = content.splitlines()
+class PythonSourceVisitor(ast.NodeVisitor):
+    """Collects imports, classes, functions, and complexity in one traversal."""
+
+    def __init__(self, file_path: str):
+        self.file_path = sys.intern(file_path)
+        self.imports = {}
         self.classes = []
-        
-    def visit_ClassDef(self, node):
-        docstring = ast.get_docstring(node)
-        
+        self.functions = []
+        self._class_stack = []
+        self._complexity_stack = []
+
+    def visit_Import(self, node):
+        if not self._complexity_stack:
+            for alias in node.names:
+                self.imports[alias.name] = None
+
+    def visit_ImportFrom(self, node):
+        if not self._complexity_stack:
+            module = node.module or ""
+            for alias in node.names:
+                self.imports[f"{module}.{alias.name}"] = None
+
+    def _extract_decorators(self, node):
         decorators = []
         for decorator in node.decorator_list:
             if isinstance(decorator, ast.Name):
                 decorators.append(decorator.id)
             elif isinstance(decorator, ast.Attribute):
                 decorators.append(f"{decorator.attr}")
-                
-        code_snippet = '\n'.join(self.lines[node.lineno-1:node.end_lineno])
-        
+        return decorators
+
+    def visit_ClassDef(self, node):
         class_element = CodeElement(
             name=node.name,
-            type="class",
-            file_path=str(self.file_path),
+            type=_TYPE_CLASS,
+            file_path=self.file_path,
             line_start=node.lineno,
-            line_end=node.end_lineno,
-            docstring=docstring,
-            decorators=decorators,
-            complexity=self._calculate_complexity(node),
-            code_snippet=code_snippet
+            line_end=getattr(node, 'end_lineno', None) or node.lineno,
+            docstring=ast.get_docstring(node),
+            decorators=self._extract_decorators(node)
         )
-        
         self.classes.append(class_element)
+
+        self._class_stack.append(node.name)
+        self._complexity_stack.append(1)
         self.generic_visit(node)
-        
-    def _calculate_complexity(self, node):
-        complexity = 1
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.For, ast.While, ast.With, ast.Try)):
-                complexity += 1
-        return complexity
-
-class PythonFunctionVisitor(ast.NodeVisitor):
-    def __init__(self, file_path: Path, content: str):
-        self.file_path = file_path
-        self.content = content
-        self.lines = content.splitlines()
-        self.functions = []
-        self.current_class = None
-        
-    def visit_ClassDef(self, node):
-        old_class = self.current_class
-        self.current_class = node.name
-        self.generic_visit(node)
-        self.current_class = old_class
-        
+        class_element.complexity = self._complexity_stack.pop()
+        self._class_stack.pop()
+
     def visit_FunctionDef(self, node):
-        docstring = ast.get_docstring(node)
-        
-        parameters = []
-        for arg in node.args.args:
-            parameters.append(arg.arg)
-            
-        decorators = []
-        for decorator in node.decorator_list:
-            if isinstance(decorator, ast.Name):
-                decorators.append(decorator.id)
-            elif isinstance(decorator, ast.Attribute):
-                decorators.append(f"{decorator.attr}")
-                
+        self._visit_function(node)
+
+    def visit_AsyncFunctionDef(self, node):
+        self._visit_function(node)
+
+    def _visit_function(self, node):
+        parameters = [arg.arg for arg in node.args.args]
+
         return_type = None
         if node.returns:
             if isinstance(node.returns, ast.Name):
                 return_type = node.returns.id
             elif isinstance(node.returns, ast.Constant):
                 return_type = str(node.returns.value)
-                
-        code_snippet = '\n'.join(self.lines[node.lineno-1:node.end_lineno])
-        
+
         function_element = CodeElement(
             name=node.name,
-            type="function",
-            file_path=str(self.file_path),
+            type=_TYPE_FUNCTION,
+            file_path=self.file_path,
             line_start=node.lineno,
-            line_end=node.end_lineno,
-            docstring=docstring,
+            line_end=getattr(node, 'end_lineno', None) or node.lineno,
+            docstring=ast.get_docstring(node),
             parameters=parameters,
             return_type=return_type,
-            decorators=decorators,
-            parent_class=self.current_class,
-            complexity=self._calculate_complexity(node),
-            code_snippet=code_snippet
+            decorators=self._extract_decorators(node),
+            parent_class=self._class_stack[-1] if self._class_stack else None
         )
-        
         self.functions.append(function_element)
+
+        self._complexity_stack.append(1)
         self.generic_visit(node)
-        
-    def _calculate_complexity(self, node):
-        complexity = 1
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.For, ast.While, ast.With, ast.Try)):
-                complexity += 1
-        return complexity
-
-from datetime import datetime 
\ No newline at end of file
+        function_element.complexity = self._complexity_stack.pop()
+
+    def _visit_branch(self, node):
+        for i in range(len(self._complexity_stack)):
+            self._complexity_stack[i] += 1
+        self.generic_visit(node)
+
+    visit_If = _visit_branch
+    visit_For = _visit_branch
+    visit_While = _visit_branch
+    visit_With = _visit_branch
+    visit_Try = _visit_branch
\ No newline at end of file
@@ -1,5 +1,11 @@
 import asyncio
-import json
+import os
+import time
+import orjson
+import aiofiles
+import aiofiles.os as aos
+
+_fsync = aiofiles.os.wrap(os.fsync)
 from typing import Dict, List, Any, Optional, Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -12,6 +18,8 @@ from rich.panel import Panel
 from rich.live import Live
 import statistics
 
+from ._math import completion_percentage, eta_seconds, agg_times
+
 console = Console()
 
 class TaskStatus(Enum):
@@ -21,7 +29,22 @@ class TaskStatus(Enum):
     FAILED = "failed"
     CANCELLED = "cancelled"
 
-@dataclass
+_STATUS_LABEL = {
+    TaskStatus.PENDING: f"⏳ {TaskStatus.PENDING.value}",
+    TaskStatus.RUNNING: f"🔄 {TaskStatus.RUNNING.value}",
+    TaskStatus.COMPLETED: f"✅ {TaskStatus.COMPLETED.value}",
+    TaskStatus.FAILED: f"❌ {TaskStatus.FAILED.value}",
+    TaskStatus.CANCELLED: f"🚫 {TaskStatus.CANCELLED.value}",
+}
+
+def _json_default(obj):
+    if isinstance(obj, TaskStatus):
+        return obj.value
+    if isinstance(obj, timedelta):
+        return obj.total_seconds()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+@dataclass(slots=True)
 class TaskProgress:
     task_id: str
     name: str
@@ -36,11 +59,19 @@ class TaskProgress:
     parent_task_id: Optional[str] = None
     subtasks: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _frozen_dict: Optional[Dict[str, Any]] = field(default=None, repr=False)
+    _start_mono: Optional[float] = field(default=None, repr=False)
+    _end_mono: Optional[float] = field(default=None, repr=False)
+    _last_update_mono: Optional[float] = field(default=None, repr=False)
+    _last_message: Optional[str] = field(default=None, repr=False)
     
     def get_completion_percentage(self) -> float:
-        return (self.progress / self.total_work) * 100 if self.total_work > 0 else 0
+        return completion_percentage(self.progress, self.total_work)
         
     def get_elapsed_time(self) -> Optional[timedelta]:
+        if self._start_mono is not None:
+            end_mono = self._end_mono if self._end_mono is not None else time.monotonic()
+            return timedelta(seconds=end_mono - self._start_mono)
         if self.start_time:
             end_time = self.end_time or datetime.now()
             return end_time - self.start_time
@@ -53,48 +84,78 @@ class TaskProgress:
         elapsed = self.get_elapsed_time()
         if not elapsed:
             return None
-            
-        completion_rate = self.progress / elapsed.total_seconds()
-        remaining_work = self.total_work - self.progress
-        
-        if completion_rate > 0:
-            estimated_remaining_seconds = remaining_work / completion_rate
+
+        estimated_remaining_seconds = eta_seconds(
+            self.progress, elapsed.total_seconds(), self.total_work
+        )
+        if estimated_remaining_seconds > 0:
             return timedelta(seconds=estimated_remaining_seconds)
-            
+
         return None
         
     def update_progress(self, progress: float, message: str = None):
+        self._frozen_dict = None
         self.progress = min(progress, self.total_work)
         if message:
-            self.metadata["last_message"] = message
-            self.metadata["last_update"] = datetime.now().isoformat()
+            self._last_message = message
+            self._last_update_mono = time.monotonic()
             
         if self.progress >= self.total_work and self.status == TaskStatus.RUNNING:
             self.complete()
             
     def start(self):
+        self._frozen_dict = None
         self.status = TaskStatus.RUNNING
         self.start_time = datetime.now()
-        
+        self._start_mono = time.monotonic()
+
     def complete(self):
+        self._frozen_dict = None
         self.status = TaskStatus.COMPLETED
         self.end_time = datetime.now()
+        self._end_mono = time.monotonic()
         self.progress = self.total_work
-        if self.start_time:
+        if self._start_mono is not None:
+            self.actual_duration = timedelta(seconds=self._end_mono - self._start_mono)
+        elif self.start_time:
             self.actual_duration = self.end_time - self.start_time
             
     def fail(self, error_message: str = None):
+        self._frozen_dict = None
         self.status = TaskStatus.FAILED
         self.end_time = datetime.now()
+        self._end_mono = time.monotonic()
         if error_message:
             self.metadata["error"] = error_message
             
     def cancel(self):
+        self._frozen_dict = None
         self.status = TaskStatus.CANCELLED
         self.end_time = datetime.now()
+        self._end_mono = time.monotonic()
         
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        if self._frozen_dict is not None and self.status in (
+            TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED
+        ):
+            return self._frozen_dict
+
+        elapsed = self.get_elapsed_time()
+        remaining = self.get_estimated_remaining_time()
+
+        metadata = self.metadata
+        if self._last_update_mono is not None:
+            metadata = dict(metadata)
+            metadata["last_message"] = self._last_message
+            if self.start_time and self._start_mono is not None:
+                last_update = self.start_time + timedelta(
+                    seconds=self._last_update_mono - self._start_mono
+                )
+            else:
+                last_update = datetime.now()
+            metadata["last_update"] = last_update.isoformat()
+
+        result = {
             "task_id": self.task_id,
             "name": self.name,
             "description": self.description,
@@ -106,30 +167,50 @@ class TaskProgress:
             "end_time": self.end_time.isoformat() if self.end_time else None,
             "estimated_duration": self.estimated_duration.total_seconds() if self.estimated_duration else None,
             "actual_duration": self.actual_duration.total_seconds() if self.actual_duration else None,
-            "elapsed_time": self.get_elapsed_time().total_seconds() if self.get_elapsed_time() else None,
-            "estimated_remaining_time": self.get_estimated_remaining_time().total_seconds() if self.get_estimated_remaining_time() else None,
+            "elapsed_time": elapsed.total_seconds() if elapsed else None,
+            "estimated_remaining_time": remaining.total_seconds() if remaining else None,
             "parent_task_id": self.parent_task_id,
             "subtasks": self.subtasks,
-            "metadata": self.metadata
+            "metadata": metadata
         }
 
+        if self.status in (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED):
+            self._frozen_dict = result
+
+        return result
+
 class ProgressTracker:
-    def __init__(self, enable_ui: bool = True, update_interval: float = 0.5):
+    def __init__(self, enable_ui: bool = True, update_interval: float = 0.5,
+                 batch_updates: bool = False):
         self.tasks: Dict[str, TaskProgress] = {}
         self.enable_ui = enable_ui
         self.update_interval = update_interval
         self.logger = logging.getLogger("progress_tracker")
         
+        self._cb_started: List[Callable] = []
+        self._cb_updated: List[Callable] = []
+        self._cb_completed: List[Callable] = []
+        self._cb_failed: List[Callable] = []
         self.callbacks: Dict[str, List[Callable]] = {
-            "task_started": [],
-            "task_updated": [],
-            "task_completed": [],
-            "task_failed": []
+            "task_started": self._cb_started,
+            "task_updated": self._cb_updated,
+            "task_completed": self._cb_completed,
+            "task_failed": self._cb_failed
         }
         
         self._running = False
         self._ui_task = None
         self._live = None
+
+        self.batch_updates = batch_updates
+        self._update_q: Optional[asyncio.Queue] = None
+        self._drain_task = None
+
+        self._by_status: Dict[TaskStatus, set] = {status: set() for status in TaskStatus}
+        self._dirty = True
+        self._ui_event = asyncio.Event()
+        self._metrics_dirty = True
+        self._metrics_cache: Optional[Dict[str, Any]] = None
         
         self.historical_data: List[Dict[str, Any]] = []
         
@@ -141,12 +222,28 @@ class ProgressTracker:
         if event in self.callbacks and callback in self.callbacks[event]:
             self.callbacks[event].remove(callback)
             
-    def _trigger_callbacks(self, event: str, task: TaskProgress):
-        for callback in self.callbacks.get(event, []):
+    def _mark_dirty(self):
+        self._dirty = True
+        self._ui_event.set()
+
+    def _transition(self, task: TaskProgress, old_status: TaskStatus):
+        if task.status is not old_status:
+            self._by_status[old_status].discard(task.task_id)
+            self._by_status[task.status].add(task.task_id)
+            self._metrics_dirty = True
+        self._mark_dirty()
+
+    def _fire(self, callbacks: List[Callable], task: TaskProgress):
+        if not callbacks:
+            return
+        for callback in callbacks:
             try:
                 callback(task)
             except Exception as e:
-                self.logger.error(f"Error in callback for {event}: {e}")
+                self.logger.error(f"Error in callback: {e}")
+
+    def _trigger_callbacks(self, event: str, task: TaskProgress):
+        self._fire(self.callbacks.get(event, []), task)
                 
     def create_task(self, task_id: str, name: str, description: str = "", 
                    total_work: float = 100.0, estimated_duration: Optional[timedelta] = None,
@@ -161,7 +258,10 @@ class ProgressTracker:
         )
         
         self.tasks[task_id] = task
-        
+        self._by_status[TaskStatus.PENDING].add(task_id)
+        self._mark_dirty()
+        self._metrics_dirty = True
+
         if parent_task_id and parent_task_id in self.tasks:
             self.tasks[parent_task_id].subtasks.append(task_id)
             
@@ -173,24 +273,38 @@ class ProgressTracker:
             return False
             
         task = self.tasks[task_id]
+        old_status = task.status
         task.start()
-        self._trigger_callbacks("task_started", task)
+        self._transition(task, old_status)
+        self._fire(self._cb_started, task)
         self.logger.info(f"Started task: {task_id}")
         return True
         
     def update_task(self, task_id: str, progress: float, message: str = None) -> bool:
         if task_id not in self.tasks:
             return False
-            
+
+        if self._update_q is not None:
+            try:
+                self._update_q.put_nowait((task_id, progress, message))
+                return True
+            except asyncio.QueueFull:
+                pass
+
+        return self._apply_update(task_id, progress, message)
+
+    def _apply_update(self, task_id: str, progress: float, message: str = None) -> bool:
         task = self.tasks[task_id]
         old_progress = task.progress
+        old_status = task.status
         task.update_progress(progress, message)
+        self._transition(task, old_status)
         
         if task.status == TaskStatus.COMPLETED and old_progress < task.total_work:
-            self._trigger_callbacks("task_completed", task)
+            self._fire(self._cb_completed, task)
             self.logger.info(f"Completed task: {task_id}")
         else:
-            self._trigger_callbacks("task_updated", task)
+            self._fire(self._cb_updated, task)
             
         return True
         
@@ -199,8 +313,10 @@ class ProgressTracker:
             return False
             
         task = self.tasks[task_id]
+        old_status = task.status
         task.complete()
-        self._trigger_callbacks("task_completed", task)
+        self._transition(task, old_status)
+        self._fire(self._cb_completed, task)
         self.logger.info(f"Completed task: {task_id}")
         return True
         
@@ -209,8 +325,10 @@ class ProgressTracker:
             return False
             
         task = self.tasks[task_id]
+        old_status = task.status
         task.fail(error_message)
-        self._trigger_callbacks("task_failed", task)
+        self._transition(task, old_status)
+        self._fire(self._cb_failed, task)
         self.logger.error(f"Failed task: {task_id} - {error_message}")
         return True
         
@@ -219,7 +337,9 @@ class ProgressTracker:
             return False
             
         task = self.tasks[task_id]
+        old_status = task.status
         task.cancel()
+        self._transition(task, old_status)
         self.logger.info(f"Cancelled task: {task_id}")
         return True
         
@@ -230,13 +350,13 @@ class ProgressTracker:
         return list(self.tasks.values())
         
     def get_active_tasks(self) -> List[TaskProgress]:
-        return [task for task in self.tasks.values() if task.status == TaskStatus.RUNNING]
+        return [self.tasks[task_id] for task_id in self._by_status[TaskStatus.RUNNING]]
         
     def get_completed_tasks(self) -> List[TaskProgress]:
-        return [task for task in self.tasks.values() if task.status == TaskStatus.COMPLETED]
+        return [self.tasks[task_id] for task_id in self._by_status[TaskStatus.COMPLETED]]
         
     def get_failed_tasks(self) -> List[TaskProgress]:
-        return [task for task in self.tasks.values() if task.status == TaskStatus.FAILED]
+        return [self.tasks[task_id] for task_id in self._by_status[TaskStatus.FAILED]]
         
     def get_overall_progress(self) -> Dict[str, Any]:
         if not self.tasks:
@@ -249,9 +369,9 @@ class ProgressTracker:
             }
             
         total_tasks = len(self.tasks)
-        completed_tasks = len(self.get_completed_tasks())
-        failed_tasks = len(self.get_failed_tasks())
-        active_tasks = len(self.get_active_tasks())
+        completed_tasks = len(self._by_status[TaskStatus.COMPLETED])
+        failed_tasks = len(self._by_status[TaskStatus.FAILED])
+        active_tasks = len(self._by_status[TaskStatus.RUNNING])
         
         overall_completion = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
         
@@ -281,8 +401,16 @@ class ProgressTracker:
         return None
         
     def get_performance_metrics(self) -> Dict[str, Any]:
+        if not self._metrics_dirty and self._metrics_cache is not None:
+            return self._metrics_cache
+
+        self._metrics_cache = self._compute_metrics()
+        self._metrics_dirty = False
+        return self._metrics_cache
+
+    def _compute_metrics(self) -> Dict[str, Any]:
         completed_tasks = self.get_completed_tasks()
-        
+
         if not completed_tasks:
             return {
                 "average_completion_time": 0,
@@ -291,25 +419,23 @@ class ProgressTracker:
                 "slowest_completion_time": 0,
                 "accuracy_rate": 0
             }
-            
+
         completion_times = [
-            task.actual_duration.total_seconds() 
-            for task in completed_tasks 
+            task.actual_duration.total_seconds()
+            for task in completed_tasks
             if task.actual_duration
         ]
-        
+
         if completion_times:
-            avg_time = statistics.mean(completion_times)
+            avg_time, fastest_time, slowest_time = agg_times(completion_times)
             median_time = statistics.median(completion_times)
-            fastest_time = min(completion_times)
-            slowest_time = max(completion_times)
         else:
             avg_time = median_time = fastest_time = slowest_time = 0
-            
+
         total_tasks = len(self.tasks)
-        failed_tasks = len(self.get_failed_tasks())
+        failed_tasks = len(self._by_status[TaskStatus.FAILED])
         accuracy_rate = ((total_tasks - failed_tasks) / total_tasks) * 100 if total_tasks > 0 else 0
-        
+
         return {
             "average_completion_time": avg_time,
             "median_completion_time": median_time,
@@ -319,12 +445,18 @@ class ProgressTracker:
         }
         
     async def start_ui(self):
-        if not self.enable_ui or self._running:
+        if self._running or not (self.enable_ui or self.batch_updates):
             return
-            
+
         self._running = True
-        self._ui_task = asyncio.create_task(self._ui_loop())
-        
+
+        if self.batch_updates:
+            self._update_q = asyncio.Queue(maxsize=10000)
+            self._drain_task = asyncio.create_task(self._drainer())
+
+        if self.enable_ui:
+            self._ui_task = asyncio.create_task(self._ui_loop())
+
     async def stop_ui(self):
         if not self._running:
             return
@@ -337,21 +469,51 @@ class ProgressTracker:
                 await self._ui_task
             except asyncio.CancelledError:
                 pass
-                
+
+        if self._drain_task:
+            await self._drain_task
+            self._drain_task = None
+            self._update_q = None
+
         if self._live:
             self._live.stop()
+
+    async def _drainer(self):
+        queue = self._update_q
+        pending: Dict[str, tuple] = {}
+
+        while self._running or not queue.empty() or pending:
+            try:
+                task_id, progress, message = await asyncio.wait_for(
+                    queue.get(), timeout=self.update_interval
+                )
+                pending[task_id] = (progress, message)
+                if not queue.empty() and len(pending) < 256:
+                    continue
+            except asyncio.TimeoutError:
+                pass
+
+            for task_id, (progress, message) in pending.items():
+                self._apply_update(task_id, progress, message)
+            pending.clear()
             
     async def _ui_loop(self):
         try:
             with Live(self._generate_ui(), refresh_per_second=2, console=console) as live:
                 self._live = live
                 while self._running:
-                    live.update(self._generate_ui())
-                    await asyncio.sleep(self.update_interval)
+                    try:
+                        await asyncio.wait_for(self._ui_event.wait(), timeout=self.update_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._ui_event.clear()
+                    if self._dirty or self._by_status[TaskStatus.RUNNING]:
+                        live.update(self._generate_ui())
         except asyncio.CancelledError:
             pass
             
     def _generate_ui(self) -> Panel:
+        self._dirty = False
         table = Table(title="Task Progress")
         table.add_column("Task ID", style="cyan")
         table.add_column("Name", style="magenta")
@@ -360,27 +522,35 @@ class ProgressTracker:
         table.add_column("Elapsed", style="yellow")
         table.add_column("Remaining", style="red")
         
-        for task in self.tasks.values():
-            status_emoji = {
-                TaskStatus.PENDING: "⏳",
-                TaskStatus.RUNNING: "🔄",
-                TaskStatus.COMPLETED: "✅",
-                TaskStatus.FAILED: "❌",
-                TaskStatus.CANCELLED: "🚫"
-            }.get(task.status, "❓")
-            
-            progress_bar = f"{task.get_completion_percentage():.1f}%"
-            elapsed = task.get_elapsed_time()
-            elapsed_str = f"{elapsed.total_seconds():.1f}s" if elapsed else "N/A"
-            
-            remaining = task.get_estimated_remaining_time()
-            remaining_str = f"{remaining.total_seconds():.1f}s" if remaining else "N/A"
-            
+        snapshot = [
+            (task.task_id[:10], task.name[:20], task.status, task.progress,
+             task.total_work, task._start_mono, task._end_mono,
+             task.estimated_duration.total_seconds() if task.estimated_duration else None)
+            for task in self.tasks.values()
+        ]
+
+        now = time.monotonic()
+        for task_id, name, status, progress, total_work, start_mono, end_mono, est_s in snapshot:
+            pct = progress * 100.0 / total_work if total_work else 0.0
+
+            if start_mono is not None:
+                elapsed_s = (end_mono if end_mono is not None else now) - start_mono
+                elapsed_str = f"{elapsed_s:.1f}s"
+            else:
+                elapsed_s = None
+                elapsed_str = "N/A"
+
+            if elapsed_s is None or progress <= 0:
+                remaining_str = f"{est_s:.1f}s" if est_s is not None else "N/A"
+            else:
+                remaining_s = eta_seconds(progress, elapsed_s, total_work)
+                remaining_str = f"{remaining_s:.1f}s" if remaining_s > 0 else "N/A"
+
             table.add_row(
-                task.task_id[:10],
-                task.name[:20],
-                f"{status_emoji} {task.status.value}",
-                progress_bar,
+                task_id,
+                name,
+                _STATUS_LABEL.get(status, status.value),
+                f"{pct:.1f}%",
                 elapsed_str,
                 remaining_str
             )
@@ -403,27 +573,39 @@ Accuracy Rate: {metrics['accuracy_rate']:.1f}%
         return Panel(f"{table}\n{summary}", title="Progress Tracker", border_style="blue")
         
     async def save_progress_report(self, file_path: str):
-        report = {
-            "timestamp": datetime.now().isoformat(),
-            "tasks": [task.to_dict() for task in self.tasks.values()],
-            "overall_progress": self.get_overall_progress(),
-            "performance_metrics": self.get_performance_metrics(),
-            "historical_data": self.historical_data
-        }
-        
+        option = orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_NAIVE_UTC
+        tmp_path = f"{file_path}.tmp"
         try:
-            with open(file_path, 'w') as f:
-                json.dump(report, f, indent=2)
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                await f.write(b'{"timestamp":')
+                await f.write(orjson.dumps(datetime.now(), option=option))
+                await f.write(b',"tasks":[')
+                first = True
+                for task in self.tasks.values():
+                    if not first:
+                        await f.write(b',')
+                    first = False
+                    await f.write(orjson.dumps(task.to_dict(), default=_json_default, option=option))
+                await f.write(b'],"overall_progress":')
+                await f.write(orjson.dumps(self.get_overall_progress()))
+                await f.write(b',"performance_metrics":')
+                await f.write(orjson.dumps(self.get_performance_metrics()))
+                await f.write(b',"historical_data":')
+                await f.write(orjson.dumps(self.historical_data, default=_json_default))
+                await f.write(b'}')
+                await f.flush()
+                await _fsync(f.fileno())
+            await aos.replace(tmp_path, file_path)
             self.logger.info(f"Progress report saved to {file_path}")
             return True
         except Exception as e:
             self.logger.error(f"Error saving progress report: {e}")
             return False
-            
+
     async def load_progress_report(self, file_path: str):
         try:
-            with open(file_path, 'r') as f:
-                report = json.load(f)
+            async with aiofiles.open(file_path, 'rb') as f:
+                report = orjson.loads(await f.read())
                 
             for task_data in report.get("tasks", []):
                 task = TaskProgress(
@@ -448,6 +630,7 @@ Accuracy Rate: {metrics['accuracy_rate']:.1f}%
                     task.actual_duration = timedelta(seconds=task_data["actual_duration"])
                     
                 self.tasks[task.task_id] = task
+                self._by_status[task.status].add(task.task_id)
                 
             self.historical_data = report.get("historical_data", [])
             self.logger.info(f"Progress report loaded from {file_path}")
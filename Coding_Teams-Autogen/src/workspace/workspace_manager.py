@@ -1,23 +1,37 @@
 import os
 import json
+import asyncio
 import shutil
 import aiofiles
+import aiofiles.os as aos
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 import logging
 
+_copy2 = aiofiles.os.wrap(shutil.copy2)
+_move = aiofiles.os.wrap(shutil.move)
+_rmtree = aiofiles.os.wrap(shutil.rmtree)
+
 class WorkspaceManager:
     def __init__(self, workspace_path: str = "./workspace"):
         self.workspace_path = Path(workspace_path)
         self.logger = logging.getLogger("workspace_manager")
-        self.created_files = []
-        self.created_directories = []
+        self.created_files = set()
+        self.created_directories = set()
+        self._known_dirs = set()
         
+    async def _ensure_dir(self, path: Path) -> None:
+        key = str(path)
+        if key in self._known_dirs:
+            return
+        await aos.makedirs(path, exist_ok=True)
+        self._known_dirs.add(key)
+
     async def initialize_workspace(self) -> None:
         """Initialize a minimal workspace directory structure"""
         try:
             # Create main workspace directory only
-            self.workspace_path.mkdir(parents=True, exist_ok=True)
+            await self._ensure_dir(self.workspace_path)
             self.logger.info(f"Minimal workspace initialized at {self.workspace_path}")
             
         except Exception as e:
@@ -30,10 +44,10 @@ class WorkspaceManager:
             full_path = self.workspace_path / file_path
             
             # Create parent directories if they don't exist
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            
+            await self._ensure_dir(full_path.parent)
+
             # Check if file exists and overwrite is False
-            if full_path.exists() and not overwrite:
+            if not overwrite and await aos.path.exists(full_path):
                 self.logger.warning(f"File {file_path} already exists, skipping")
                 return False
                 
@@ -41,7 +55,7 @@ class WorkspaceManager:
             async with aiofiles.open(full_path, 'w', encoding='utf-8') as f:
                 await f.write(content)
                 
-            self.created_files.append(str(full_path))
+            self.created_files.add(str(full_path))
             self.logger.info(f"Created file: {file_path}")
             return True
             
@@ -49,12 +63,43 @@ class WorkspaceManager:
             self.logger.error(f"Failed to create file {file_path}: {str(e)}")
             return False
             
+    async def create_files(self, items: List[tuple], overwrite: bool = False,
+                           concurrency: int = 32) -> List[bool]:
+        """Create many files concurrently; returns a bool (or exception) per item"""
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _one(file_path, content):
+            async with sem:
+                return await self.create_file(file_path, content, overwrite=overwrite)
+
+        return await asyncio.gather(*[_one(p, c) for p, c in items], return_exceptions=True)
+
+    async def read_files(self, paths: List[str], concurrency: int = 32) -> List[Optional[str]]:
+        """Read many files concurrently; results align with the input order"""
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _one(file_path):
+            async with sem:
+                return await self.read_file(file_path)
+
+        return await asyncio.gather(*[_one(p) for p in paths], return_exceptions=True)
+
+    async def delete_files(self, paths: List[str], concurrency: int = 32) -> List[bool]:
+        """Delete many files concurrently; returns a bool (or exception) per path"""
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _one(file_path):
+            async with sem:
+                return await self.delete_file(file_path)
+
+        return await asyncio.gather(*[_one(p) for p in paths], return_exceptions=True)
+
     async def read_file(self, file_path: str) -> Optional[str]:
         """Read a file from the workspace"""
         try:
             full_path = self.workspace_path / file_path
             
-            if not full_path.exists():
+            if not await aos.path.exists(full_path):
                 self.logger.warning(f"File {file_path} does not exist")
                 return None
                 
@@ -72,15 +117,13 @@ class WorkspaceManager:
         try:
             full_path = self.workspace_path / file_path
             
-            if not full_path.exists():
+            if not await aos.path.exists(full_path):
                 self.logger.warning(f"File {file_path} does not exist")
                 return False
-                
-            full_path.unlink()
+
+            await aos.remove(full_path)
             
-            # Remove from created_files list if present
-            if str(full_path) in self.created_files:
-                self.created_files.remove(str(full_path))
+            self.created_files.discard(str(full_path))
                 
             self.logger.info(f"Deleted file: {file_path}")
             return True
@@ -93,9 +136,9 @@ class WorkspaceManager:
         """Create a directory in the workspace"""
         try:
             full_path = self.workspace_path / directory_path
-            full_path.mkdir(parents=True, exist_ok=True)
+            await self._ensure_dir(full_path)
             
-            self.created_directories.append(str(full_path))
+            self.created_directories.add(str(full_path))
             self.logger.info(f"Created directory: {directory_path}")
             return True
             
@@ -108,18 +151,18 @@ class WorkspaceManager:
         try:
             full_path = self.workspace_path / directory_path
             
-            if not full_path.exists():
+            if not await aos.path.exists(full_path):
                 self.logger.warning(f"Directory {directory_path} does not exist")
                 return False
-                
+
             if recursive:
-                shutil.rmtree(full_path)
+                await _rmtree(full_path)
+                self._known_dirs.clear()
             else:
-                full_path.rmdir()
+                await aos.rmdir(full_path)
+                self._known_dirs.discard(str(full_path))
                 
-            # Remove from created_directories list if present
-            if str(full_path) in self.created_directories:
-                self.created_directories.remove(str(full_path))
+            self.created_directories.discard(str(full_path))
                 
             self.logger.info(f"Deleted directory: {directory_path}")
             return True
@@ -138,10 +181,29 @@ class WorkspaceManager:
                 
             if not full_path.exists():
                 return []
-                
+
+            if pattern in ("*", "**/*"):
+                # Fast path: scandir avoids glob's per-entry Path construction
+                prefix_len = len(str(self.workspace_path)) + 1
+                recursive = pattern == "**/*"
+                relative_files = []
+                stack = [str(full_path)]
+                while stack:
+                    try:
+                        entries = os.scandir(stack.pop())
+                    except OSError:
+                        continue
+                    with entries:
+                        for entry in entries:
+                            if entry.is_file(follow_symlinks=False):
+                                relative_files.append(entry.path[prefix_len:])
+                            elif recursive and entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                return relative_files
+
             files = list(full_path.glob(pattern))
             relative_files = [str(f.relative_to(self.workspace_path)) for f in files if f.is_file()]
-            
+
             return relative_files
             
         except Exception as e:
@@ -153,17 +215,17 @@ class WorkspaceManager:
         try:
             full_path = self.workspace_path / file_path
             
-            if not full_path.exists():
+            if not await aos.path.exists(full_path):
                 return None
-                
-            stat = full_path.stat()
-            
+
+            stat = await aos.stat(full_path)
+
             return {
                 "path": file_path,
                 "size": stat.st_size,
                 "modified": stat.st_mtime,
-                "is_file": full_path.is_file(),
-                "is_directory": full_path.is_dir()
+                "is_file": await aos.path.isfile(full_path),
+                "is_directory": await aos.path.isdir(full_path)
             }
             
         except Exception as e:
@@ -176,16 +238,16 @@ class WorkspaceManager:
             source_full = self.workspace_path / source_path
             dest_full = self.workspace_path / destination_path
             
-            if not source_full.exists():
+            if not await aos.path.exists(source_full):
                 self.logger.error(f"Source file {source_path} does not exist")
                 return False
-                
+
             # Create destination directory if it doesn't exist
-            dest_full.parent.mkdir(parents=True, exist_ok=True)
-            
-            shutil.copy2(source_full, dest_full)
+            await self._ensure_dir(dest_full.parent)
+
+            await _copy2(source_full, dest_full)
             
-            self.created_files.append(str(dest_full))
+            self.created_files.add(str(dest_full))
             self.logger.info(f"Copied file from {source_path} to {destination_path}")
             return True
             
@@ -199,19 +261,18 @@ class WorkspaceManager:
             source_full = self.workspace_path / source_path
             dest_full = self.workspace_path / destination_path
             
-            if not source_full.exists():
+            if not await aos.path.exists(source_full):
                 self.logger.error(f"Source file {source_path} does not exist")
                 return False
-                
+
             # Create destination directory if it doesn't exist
-            dest_full.parent.mkdir(parents=True, exist_ok=True)
-            
-            shutil.move(source_full, dest_full)
+            await self._ensure_dir(dest_full.parent)
+
+            await _move(source_full, dest_full)
             
-            # Update created_files list
-            if str(source_full) in self.created_files:
-                self.created_files.remove(str(source_full))
-            self.created_files.append(str(dest_full))
+            # Update created_files tracking
+            self.created_files.discard(str(source_full))
+            self.created_files.add(str(dest_full))
             
             self.logger.info(f"Moved file from {source_path} to {destination_path}")
             return True
@@ -232,11 +293,12 @@ class WorkspaceManager:
     async def cleanup_workspace(self) -> bool:
         """Clean up the entire workspace"""
         try:
-            if self.workspace_path.exists():
-                shutil.rmtree(self.workspace_path)
+            if await aos.path.exists(self.workspace_path):
+                await _rmtree(self.workspace_path)
                 
             self.created_files.clear()
             self.created_directories.clear()
+            self._known_dirs.clear()
             
             self.logger.info(f"Workspace cleaned up: {self.workspace_path}")
             return True
@@ -0,0 +1,51 @@
+import copy
+import functools
+import pytest
+from src.agents.base_agent import BaseAgent
+
+class MockAgent(BaseAgent):
+    def __init__(self, name, role, system_prompt):
+        super().__init__(name, role, system_prompt)
+
+    def get_success_signal(self):
+        return "MOCK_SUCCESS"
+
+    def get_termination_signal(self):
+        return "MOCK_EXIT"
+
+    async def execute_step(self, step_info):
+        return self.report_progress("Mock step executed")
+
+@pytest.fixture(scope="session", autouse=True)
+def _memoize_signals():
+    # Patch the concrete class: the abstract BaseAgent methods are always
+    # overridden, so caching them there would never be hit.
+    orig_success = MockAgent.get_success_signal
+    orig_termination = MockAgent.get_termination_signal
+    MockAgent.get_success_signal = functools.lru_cache(maxsize=None)(orig_success)
+    MockAgent.get_termination_signal = functools.lru_cache(maxsize=None)(orig_termination)
+    yield
+    MockAgent.get_success_signal = orig_success
+    MockAgent.get_termination_signal = orig_termination
+
+class CountingMockAgent(MockAgent):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._n = 0
+
+    def send_message(self, *args, **kwargs):
+        message = super().send_message(*args, **kwargs)
+        self._n += 1
+        return message
+
+@pytest.fixture(scope="session")
+def _mock_agent_prototype():
+    return CountingMockAgent("test_agent", "Test Agent", "Test prompt")
+
+@pytest.fixture
+def agent(_mock_agent_prototype):
+    agent = copy.copy(_mock_agent_prototype)
+    agent.messages = []
+    agent.is_active = True
+    agent._n = 0
+    return agent
@@ -1,91 +1,98 @@
 import pytest
-import asyncio
-from unittest.mock import Mock, AsyncMock
-from src.agents.base_agent import BaseAgent, MessageTag
+from src.agents.base_agent import MessageTag
 from src.project.project_plan import ProjectPlan, ProjectStep
 from src.team.coding_team import CodingTeam, CodingTeamConfig
 
 class TestBaseAgent:
-    def test_base_agent_initialization(self):
-        agent = MockAgent("test_agent", "Test Agent", "Test prompt")
+    def test_base_agent_initialization(self, agent):
         assert agent.name == "test_agent"
         assert agent.role == "Test Agent"
         assert agent.is_active == True
-        assert len(agent.messages) == 0
+        assert agent._n == 0
         
-    def test_send_message(self):
-        agent = MockAgent("test_agent", "Test Agent", "Test prompt")
+    def test_send_message(self, agent):
         message = agent.send_message(MessageTag.PROGRESS, "Test", "Test content")
         
         assert message.role == "Test Agent"
         assert message.tag == MessageTag.PROGRESS
         assert message.title == "Test"
         assert message.content == "Test content"
-        assert len(agent.messages) == 1
+        assert agent._n == 1
         
-    def test_terminate(self):
-        agent = MockAgent("test_agent", "Test Agent", "Test prompt")
+    def test_terminate(self, agent):
         message = agent.terminate()
         
         assert not agent.is_active
         assert message.tag == MessageTag.AGENT_EXIT
 
+@pytest.fixture
+def empty_plan():
+    return ProjectPlan("Test Project", "Test Description")
+
+@pytest.fixture
+def two_step_plan(empty_plan):
+    step1 = ProjectStep("STEP_01", "Step 1", "Description", "Owner")
+    step2 = ProjectStep("STEP_02", "Step 2", "Description", "Owner", dependencies=["STEP_01"])
+    empty_plan.add_step(step1)
+    empty_plan.add_step(step2)
+    return empty_plan, step1, step2
+
 class TestProjectPlan:
-    def test_project_plan_creation(self):
-        plan = ProjectPlan("Test Project", "Test Description")
-        assert plan.project_name == "Test Project"
-        assert plan.description == "Test Description"
-        assert len(plan.steps) == 0
-        
-    def test_add_step(self):
-        plan = ProjectPlan("Test Project", "Test Description")
+    def test_project_plan_creation(self, empty_plan):
+        assert empty_plan.project_name == "Test Project"
+        assert empty_plan.description == "Test Description"
+        assert len(empty_plan.steps) == 0
+
+    def test_add_step(self, empty_plan):
         step = ProjectStep("STEP_01", "Test Step", "Test Description", "Test Owner")
-        plan.add_step(step)
-        
-        assert len(plan.steps) == 1
-        assert plan.get_step_by_id("STEP_01") == step
-        
-    def test_get_next_step(self):
-        plan = ProjectPlan("Test Project", "Test Description")
-        step1 = ProjectStep("STEP_01", "Step 1", "Description", "Owner")
-        step2 = ProjectStep("STEP_02", "Step 2", "Description", "Owner", dependencies=["STEP_01"])
-        
-        plan.add_step(step1)
-        plan.add_step(step2)
-        
+        empty_plan.add_step(step)
+
+        assert len(empty_plan.steps) == 1
+        assert empty_plan.get_step_by_id("STEP_01") == step
+
+    def test_get_next_step(self, two_step_plan):
+        plan, step1, step2 = two_step_plan
+
         next_step = plan.get_next_step()
         assert next_step == step1
-        
+
         step1.complete_step()
         next_step = plan.get_next_step()
         assert next_step == step2
 
-class TestCodingTeamConfig:
-    def test_config_creation(self):
-        config = CodingTeamConfig(
-            claude_config={"test": "config"},
-            output_directory="test_output",
-            log_level="DEBUG"
-        )
-        
-        assert config.claude_config == {"test": "config"}
-        assert config.output_directory == "test_output"
-        assert config.log_level == "DEBUG"
-        assert config.max_escalation_attempts == 3
-        assert config.step_timeout_minutes == 30
+    @pytest.mark.parametrize("deps_graph,completion_order,expected_sequence", [
+        ([("A", []), ("B", ["A"])], ["A"], ["A", "B"]),
+        ([("A", []), ("B", []), ("C", ["A", "B"])], ["A", "B"], ["A|B", "A|B", "C"]),
+        ([("A", []), ("B", ["A"]), ("C", ["A"]), ("D", ["B", "C"])],
+         ["A", "B", "C"], ["A", "B|C", "B|C", "D"]),
+    ])
+    def test_get_next_step_dag(self, empty_plan, deps_graph, completion_order, expected_sequence):
+        for step_id, deps in deps_graph:
+            empty_plan.add_step(ProjectStep(step_id, f"Step {step_id}", "Description", "Owner",
+                                            dependencies=deps))
 
-class MockAgent(BaseAgent):
-    def __init__(self, name, role, system_prompt):
-        super().__init__(name, role, system_prompt)
-        
-    def get_success_signal(self):
-        return "MOCK_SUCCESS"
-        
-    def get_termination_signal(self):
-        return "MOCK_EXIT"
-        
-    async def execute_step(self, step_info):
-        return self.report_progress("Mock step executed")
+        for i, expected in enumerate(expected_sequence):
+            next_step = empty_plan.get_next_step()
+            assert next_step is not None
+            assert next_step.step_id in expected.split("|")
+            if i < len(completion_order):
+                empty_plan.get_step_by_id(completion_order[i]).complete_step()
 
-if __name__ == "__main__":
-    pytest.main([__file__]) 
\ No newline at end of file
+@pytest.fixture(scope="module")
+def config():
+    return CodingTeamConfig(
+        claude_config={"test": "config"},
+        output_directory="test_output",
+        log_level="DEBUG"
+    )
+
+class TestCodingTeamConfig:
+    @pytest.mark.parametrize("attr,expected", [
+        ("claude_config", {"test": "config"}),
+        ("output_directory", "test_output"),
+        ("log_level", "DEBUG"),
+        ("max_escalation_attempts", 3),
+        ("step_timeout_minutes", 10),
+    ])
+    def test_config_creation(self, config, attr, expected):
+        assert getattr(config, attr) == expected
\ No newline at end of file
@@ -0,0 +1,21 @@
+import pytest
+from src.tools import code_analyzer
+
+GENERIC_COMMENT_PREFIXES = ('//', '#', '/*', '*')
+
+@pytest.mark.skipif(code_analyzer.np is None, reason="numpy not installed")
+class TestGenericLineCounts:
+    @pytest.mark.parametrize("content", [
+        "",
+        "a\n\n",
+        "// c\ncode\n\n\n",
+        "\n\n\n",
+        "code\n",
+        "code",
+        "# comment\n   \n\t\ncode\n\n",
+        "/* block */\nint x;\n \n",
+    ])
+    def test_numpy_counts_match_fallback(self, content):
+        expected = code_analyzer._count_lines(content.splitlines(),
+                                              GENERIC_COMMENT_PREFIXES)
+        assert code_analyzer._count_generic_lines_np(content) == expected